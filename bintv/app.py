@@ -3,12 +3,15 @@ from bintv.widgets.hex_view import *
 from bintv.widgets.reactive_construct_tree import *
 from bintv.neon_pallete import *
 
+from textual import work
 from textual.app import App
 from textual.geometry import Size 
 from textual.containers import Grid, Vertical, Horizontal
+from textual.css.query import NoMatches
 from textual.reactive import reactive
 from textual.screen import ModalScreen
 from textual.widgets import Placeholder, DirectoryTree, TextArea, TabbedContent, TabPane, Log, Static, Button, Label
+from textual.worker import get_current_worker
 
 import io
 import os
@@ -159,6 +162,12 @@ class BintvApp(App):
         ("ctrl+q", "quit", "Quit application")
     ]
 
+    # Files at least this large are parsed in a worker thread so the UI
+    # stays responsive; smaller ones are parsed inline as before.
+    THREADED_PARSE_SIZE = 1 << 20
+    # Quiet period after the last edit before a background parse starts
+    PARSE_DELAY = 0.3
+
     def __init__(self, target):
         super().__init__()
         self.data = bytearray(b"")
@@ -168,6 +177,12 @@ class BintvApp(App):
         self.pane_count = 0
         self.has_unsaved_changes = False
         self.modified_fields = {}  # Track which fields have been modified
+        self._flattened_construct_data = []
+        # Bumped on every parse request; stale background parses are dropped
+        self._parse_generation = 0
+        # True while a background parse for the current data is running
+        self._parse_pending = False
+        self._parse_timer = None
 
     def action_load_binary(self):
         if not self.query_one("#file-chooser").visible:
@@ -186,8 +201,9 @@ class BintvApp(App):
             filename = f"binteractiview_{safe_name}.svg"
             
             with open(filename, "w") as f:
-                # Use generate_text_colors for SVG (Bright text on dark bg)
-                f.write(create_svg(self._flattened_construct_data, self.data, title=f"{safe_name}"))
+                # Stream the fragments instead of building the whole document
+                exporter = CorkamistyleSVGExporter()
+                f.writelines(exporter.export_iter(self._flattened_construct_data, self.data, title=f"{safe_name}"))
             self.log_message(f"Exported to {filename}")
 
     def action_toggle_log(self):
@@ -327,22 +343,70 @@ class BintvApp(App):
         return eval(new_pattern)
 
     def on_text_area_changed(self, msg):
+        self._parse_generation += 1
+        self._parse_pending = False
+        if self._parse_timer is not None:
+            self._parse_timer.stop()
+            self._parse_timer = None
         try:
             self._subcons_text = msg.text_area.text
             self._construct = self.eval_with_ts(self._subcons_text)
-            self._parsed_data = self._construct.parse(self.data)
-            self.query_one("#construct-tree").parsed_data = self._parsed_data
-            self._flattened_construct_data = self.flatten_construct_offsets()
-            
-            # FIX: Use background colors (Dark) for TUI so white text is readable
-            self.query_one(f"#hex-pane-{self.pane_count}-hex-view").elements = (
-                self._flattened_construct_data, 
-                neon_background_colors(len(self._flattened_construct_data))
-            )
-            
-            self.log_message(f"Successfully parsed {len(self._flattened_construct_data)} fields")
+            if len(self.data) >= self.THREADED_PARSE_SIZE:
+                # The previous structure doesn't describe these bytes; drop it
+                # so cursor lookups and highlighting wait for the new parse
+                self._parse_pending = True
+                self._flattened_construct_data = []
+                self.query_one(f"#hex-pane-{self.pane_count}-hex-view").elements = None
+                self._refresh_cursor_field()
+                # Wait for a pause in typing so each keystroke doesn't copy
+                # the buffer and start a thread that can't be stopped
+                self._parse_timer = self.set_timer(self.PARSE_DELAY, self._start_background_parse)
+                return
+            self._apply_parsed_data(self._construct.parse(self.data))
+        except Exception as e:
+            self.log_message(f"Parse error: {str(e)}", level="error")
+
+    def _apply_parsed_data(self, parsed_data):
+        self._parsed_data = parsed_data
+        self.query_one("#construct-tree").parsed_data = self._parsed_data
+        self._flattened_construct_data = self.flatten_construct_offsets()
+        
+        # FIX: Use background colors (Dark) for TUI so white text is readable
+        self.query_one(f"#hex-pane-{self.pane_count}-hex-view").elements = (
+            self._flattened_construct_data, 
+            neon_background_colors(len(self._flattened_construct_data))
+        )
+        
+        self.log_message(f"Successfully parsed {len(self._flattened_construct_data)} fields")
+
+    def _start_background_parse(self):
+        self._parse_timer = None
+        self.log_message(f"Parsing {len(self.data)} bytes in the background...")
+        # Snapshot the buffer; patches may land while the worker runs
+        self._parse_in_background(self._construct, bytes(self.data), self._parse_generation)
+
+    def _finish_background_parse(self, generation, parsed_data, error):
+        # A newer edit or file switch has superseded this parse
+        if generation != self._parse_generation:
+            return
+        self._parse_pending = False
+        try:
+            if error is not None:
+                raise error
+            self._apply_parsed_data(parsed_data)
         except Exception as e:
             self.log_message(f"Parse error: {str(e)}", level="error")
+        self._refresh_cursor_field()
+
+    @work(thread=True, exclusive=True, group="construct-parse")
+    def _parse_in_background(self, construct_obj, data, generation):
+        parsed_data = error = None
+        try:
+            parsed_data = construct_obj.parse(data)
+        except Exception as e:
+            error = e
+        if not get_current_worker().is_cancelled:
+            self.call_from_thread(self._finish_background_parse, generation, parsed_data, error)
 
     def on_tabbed_content_tab_activated(self, msg):
         try:
@@ -374,8 +438,18 @@ class BintvApp(App):
         
         self.log_message(f"Loaded file: {msg.path} ({len(self.data)} bytes)")
 
+    def _refresh_cursor_field(self):
+        """Re-resolve the field under the current hex view's cursor"""
+        try:
+            hex_view = self.query_one(f"#hex-pane-{self.pane_count}-hex-view")
+            self.on_hex_view_cursor_update(HexView.CursorUpdate(hex_view.id, hex_view.get_byte_cursor()))
+        except NoMatches:
+            pass
+
     def on_hex_view_cursor_update(self, msg):
         the_name = "root"
+        # Empty until the first parse has landed
+        name = start = end = None
 
         for item in self._flattened_construct_data:
             name = item["name"]
@@ -383,7 +457,11 @@ class BintvApp(App):
             end = item["end"]
             if end and name and start <= msg.offset and msg.offset < end:
                 the_name = name
-        self.query_one(f"#{msg.id}-bottom-line").update(f"{hex(msg.offset)} - Currently on field {the_name}")
+        if self._parse_pending:
+            status = "Parsing structure..."
+        else:
+            status = f"Currently on field {the_name}"
+        self.query_one(f"#{msg.id}-bottom-line").update(f"{hex(msg.offset)} - {status}")
         self.query_one(f"#{msg.id}").highlighted_field = (name, start, end)
 
     def on_reactive_construct_tree_field_edit_request(self, msg: ReactiveConstructTree.FieldEditRequest) -> None:
@@ -393,6 +471,11 @@ class BintvApp(App):
         2. Refresh Hex View.
         3. Re-parse the tree to show new values/offsets.
         """
+        # The tree still shows the previous parse; its offsets may not
+        # match the bytes being parsed
+        if self._parse_pending:
+            self.log_message("⚠️ Still parsing; edit ignored.", level="warning")
+            return
         try:
             # --- 1. PREPARE DATA ---
             start_offset = msg.offset
@@ -438,8 +521,6 @@ class BintvApp(App):
 
     def _value_to_bytes(self, value, value_type: str, expected_size: int, original_value) -> bytes:
         """Helper to pack values back into bytes."""
-        import struct
-        
         try:
             if isinstance(value, bytes):
                 return value
@@ -463,11 +544,11 @@ class BintvApp(App):
                     # Fallback for weird sizes (e.g. 3 bytes): manual int-to-bytes
                     return int(value).to_bytes(expected_size, byteorder='little', signed=is_signed)
                     
-                return struct.pack(fmt, int(value))
+                return struct_module.pack(fmt, int(value))
 
             elif value_type == "float":
-                if expected_size == 4: return struct.pack('<f', float(value))
-                if expected_size == 8: return struct.pack('<d', float(value))
+                if expected_size == 4: return struct_module.pack('<f', float(value))
+                if expected_size == 8: return struct_module.pack('<d', float(value))
 
             elif value_type == "str":
                 return str(value).encode('utf-8')
@@ -479,6 +560,9 @@ class BintvApp(App):
 
     def on_reactive_construct_tree_goto_offset_request(self, msg: ReactiveConstructTree.GotoOffsetRequest) -> None:
         """Handle goto offset request from tree."""
+        if self._parse_pending:
+            self.log_message("⚠️ Still parsing; go to offset ignored.", level="warning")
+            return
         # Set cursor to the specified offset in hex view
         hex_view = self.query_one(f"#hex-pane-{self.pane_count}-hex-view")
         hex_view.nibble_cursor = (msg.offset << 1) & ~1
@@ -330,22 +330,19 @@ class ParsedPacket:
     @staticmethod
     def _format_ip(ip_bytes: bytes) -> str:
         if len(ip_bytes) == 4:
-            return ".".join(str(b) for b in ip_bytes)
+            return "%d.%d.%d.%d" % tuple(ip_bytes)
         return ""
     
     @staticmethod
     def _format_ipv6(ip_bytes: bytes) -> str:
         if len(ip_bytes) == 16:
-            parts = []
-            for i in range(0, 16, 2):
-                parts.append(f"{ip_bytes[i]:02x}{ip_bytes[i+1]:02x}")
-            return ":".join(parts)
+            return ip_bytes.hex(":", 2)
         return ""
     
     @staticmethod
     def _format_mac(mac_bytes: bytes) -> str:
         if len(mac_bytes) == 6:
-            return ":".join(f"{b:02x}" for b in mac_bytes)
+            return mac_bytes.hex(":")
         return ""
     
     def search_fields(self, query: str, min_score: float = 0.3) -> List[Tuple[ParsedField, float]]:
@@ -767,17 +764,14 @@ class PCAPParser:
 
 def format_mac(mac_bytes: bytes) -> str:
     """Format MAC address bytes as string"""
-    return ":".join(f"{b:02x}" for b in mac_bytes)
+    return mac_bytes.hex(":")
 
 
 def format_ip(ip_bytes: bytes) -> str:
     """Format IPv4 address bytes as string"""
-    return ".".join(str(b) for b in ip_bytes)
+    return ".".join(map(str, ip_bytes))
 
 
 def format_ipv6(ip_bytes: bytes) -> str:
     """Format IPv6 address bytes as string"""
-    parts = []
-    for i in range(0, 16, 2):
-        parts.append(f"{ip_bytes[i]:02x}{ip_bytes[i+1]:02x}")
-    return ":".join(parts)
+    return ip_bytes[:16].hex(":", 2)
@@ -1,4 +1,5 @@
 import html
+from bisect import bisect_left, bisect_right
 from construct import Container, ListContainer
 
 # Import enhanced v2 exporter
@@ -189,6 +190,18 @@ def create_svg_legacy(flattened_data, raw_data, title="BINARY STRUCTURE", width=
     
     byte_row_map = {}
     
+    # Bucket fields by the rendered rows they cover, keeping list order so
+    # the first matching field still wins for each byte
+    rendered_rows = [r for r in rows_to_render if r != 'SKIP']
+    row_fields = {}
+    for f_idx, field in enumerate(flattened_data):
+        if field['start'] is None:
+            continue
+        lo = bisect_left(rendered_rows, field['start'] // hex_cols)
+        hi = bisect_right(rendered_rows, (field['end'] - 1) // hex_cols)
+        for r in rendered_rows[lo:hi]:
+            row_fields.setdefault(r, []).append((field['start'], field['end'], palette[f_idx % len(palette)]))
+    
     y_cursor = margin_y
     
     for row_item in rows_to_render:
@@ -203,13 +216,14 @@ def create_svg_legacy(flattened_data, raw_data, title="BINARY STRUCTURE", width=
             svg.append(f'<text x="{x_offset_col}" y="{y_cursor}" class="hex-offset">{i:04X}</text>')
             
             chunk = raw_data[i:i+hex_cols]
+            fields_in_row = row_fields.get(row_item, ())
             for c_idx, byte in enumerate(chunk):
                 abs_idx = i + c_idx
                 
                 byte_color = text_dim
-                for f_idx, field in enumerate(flattened_data):
-                    if field['start'] is not None and field['start'] <= abs_idx < field['end']:
-                        byte_color = palette[f_idx % len(palette)]
+                for start, end, color in fields_in_row:
+                    if start <= abs_idx < end:
+                        byte_color = color
                         break
                 
                 bx = x_hex_col + (c_idx * hex_byte_w)
@@ -10,12 +10,17 @@ Designed for clear visualization of binary structures with:
 """
 
 import html
+from bisect import bisect_left, bisect_right
 from construct import Container, ListContainer
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
 
+# Dotted-path segments of construct internals (RawCopy bookkeeping, streams)
+_EXCLUDED_SEGMENTS = frozenset({'offset1', 'offset2', 'length', '_io', 'subcon'})
+
+
 class ValueRepr(Enum):
     """Types of value representation"""
     RAW_HEX = "raw"
@@ -65,7 +70,7 @@ def format_raw_hex(data: bytes, max_bytes: int = 16) -> str:
     """Format bytes as hex string"""
     if not data:
         return ""
-    hex_str = ' '.join(f'{b:02X}' for b in data[:max_bytes])
+    hex_str = data[:max_bytes].hex(' ').upper()
     if len(data) > max_bytes:
         hex_str += f' ... (+{len(data) - max_bytes})'
     return hex_str
@@ -129,14 +134,14 @@ def is_data_different(raw: bytes, decoded: Any) -> bool:
     
     # For integers, check if the decoded value matches raw interpretation
     if isinstance(decoded, int) and raw:
-        # Try common encodings
+        # Try common encodings, little-endian first; raw from arbitrary
+        # field dicts may not be bytes-like (str, out-of-range ints)
         if len(raw) <= 8:
             try:
-                le_val = int.from_bytes(raw, 'little', signed=False)
-                be_val = int.from_bytes(raw, 'big', signed=False)
-                if decoded not in (le_val, be_val):
-                    return True
-            except:
+                if decoded == int.from_bytes(raw, 'little'):
+                    return False
+                return decoded != int.from_bytes(raw, 'big')
+            except (TypeError, ValueError):
                 pass
     
     return False
@@ -168,6 +173,10 @@ class CorkamistyleSVGExporter:
         '#8BC34A', '#673AB7', '#009688', '#FFC107', '#795548',
     ]
     
+    # Per-byte hex dump text, indexed by byte value
+    _HEX_BYTE = [f'{b:02X}' for b in range(256)]
+    _ASCII_ESCAPE = [html.escape(chr(b)) if 32 <= b < 127 else '·' for b in range(256)]
+    
     def __init__(self, width: int = 1600, font_family: str = "Fira Code, Consolas, monospace"):
         self.width = width
         self.font_family = font_family
@@ -187,12 +196,18 @@ class CorkamistyleSVGExporter:
         """HTML escape text for SVG"""
         return html.escape(str(text))
     
-    def _get_field_color(self, index: int) -> str:
-        """Get color for a field by index"""
-        return self.FIELD_COLORS[index % len(self.FIELD_COLORS)]
+    def _get_field_color_index(self, index: int) -> int:
+        """Get the FIELD_COLORS slot (CSS classes .c<n>/.s<n>) for a field by index"""
+        return index % len(self.FIELD_COLORS)
     
     def _add_defs(self):
         """Add SVG definitions (styles, filters, markers)"""
+        # Field colors as fill (.c<n>) and stroke (.s<n>) classes, so elements
+        # reference a short class name instead of repeating the color
+        field_color_rules = '\n            '.join(
+            f'.c{i} {{ fill: {color}; }} .s{i} {{ stroke: {color}; }}'
+            for i, color in enumerate(self.FIELD_COLORS)
+        )
         self.svg_parts.append(f'''
     <defs>
         <style>
@@ -298,6 +313,9 @@ class CorkamistyleSVGExporter:
                 font-size: 10px;
                 fill: {self.COLORS['text_dim']};
             }}
+            
+            .c-dim {{ fill: {self.COLORS['text_dim']}; }}
+            {field_color_rules}
         </style>
         
         <filter id="glow" x="-20%" y="-20%" width="140%" height="140%">
@@ -346,39 +364,54 @@ class CorkamistyleSVGExporter:
               stroke="{self.COLORS['accent']}" stroke-width="2" opacity="0.4"/>
         ''')
     
-    def _render_hex_dump(self, raw_data: bytes, fields: List[Dict], y_start: int) -> Tuple[int, Dict[int, int]]:
+    def _row_byte_colors(self, fields: List[Dict], rows: List[int]) -> Dict[int, List[str]]:
+        """
+        Map each rendered row to the color classes of its bytes.
+        The first field covering a byte wins, as in a front-to-back scan.
+        """
+        cols = self.hex_cols
+        row_colors = {row: ['c-dim'] * cols for row in rows}
+        
+        # Paint back to front so earlier fields overwrite later ones; only
+        # the rendered rows each field spans are touched
+        for f_idx in range(len(fields) - 1, -1, -1):
+            field = fields[f_idx]
+            start = field.get('start')
+            if start is None:
+                continue
+            end = field['end']
+            color = f'c{self._get_field_color_index(f_idx)}'
+            first = bisect_left(rows, start // cols)
+            last = bisect_right(rows, (end - 1) // cols)
+            for row in rows[first:last]:
+                row_offset = row * cols
+                lo = max(start, row_offset) - row_offset
+                hi = min(end, row_offset + cols) - row_offset
+                if lo < hi:
+                    row_colors[row][lo:hi] = [color] * (hi - lo)
+        
+        return row_colors
+    
+    @staticmethod
+    def _color_runs(colors: List[str], count: int) -> List[Tuple[str, int, int]]:
+        """Split the first count columns into (color, lo, hi) runs of one color"""
+        runs = []
+        lo = 0
+        for col_idx in range(1, count + 1):
+            if col_idx == count or colors[col_idx] != colors[lo]:
+                runs.append((colors[lo], lo, col_idx))
+                lo = col_idx
+        return runs
+    
+    def _render_hex_dump(self, raw_data: bytes, fields: List[Dict], rows_to_render: List,
+                         y_start: int) -> Tuple[int, Dict[int, int]]:
         """
-        Render the hex dump with color-coded fields.
+        Render the hex dump rows from _get_sparse_rows with color-coded fields.
         Returns (end_y, byte_to_y_map)
         """
         byte_row_map = {}
         
-        # Calculate which rows to show (sparse view for large files)
-        interesting_rows = set([0, (len(raw_data) - 1) // self.hex_cols])
-        
-        for field in fields:
-            if field.get('start') is not None:
-                start_row = field['start'] // self.hex_cols
-                end_row = (field['end'] - 1) // self.hex_cols
-                interesting_rows.add(start_row)
-                interesting_rows.add(end_row)
-                # Add a row before and after for context
-                if start_row > 0:
-                    interesting_rows.add(start_row - 1)
-                interesting_rows.add(end_row + 1)
-        
-        sorted_rows = sorted(list(interesting_rows))
-        rows_to_render = []
-        
-        if sorted_rows:
-            prev = sorted_rows[0]
-            rows_to_render.append(prev)
-            for r in sorted_rows[1:]:
-                if r > prev + 1:
-                    rows_to_render.append('SKIP')
-                if r != prev:
-                    rows_to_render.append(r)
-                prev = r
+        row_colors = self._row_byte_colors(fields, [r for r in rows_to_render if r != 'SKIP'])
         
         # Layout positions - carefully calculated for alignment
         x_offset = self.margin_x
@@ -417,6 +450,13 @@ class CorkamistyleSVGExporter:
         
         y = divider_y + 16
         
+        # Byte x positions, aligned with the header (gap between 7th and 8th)
+        hex_xs = [x_hex + (col_idx * self.hex_byte_w) + (15 if col_idx >= 8 else 0)
+                  for col_idx in range(self.hex_cols)]
+        ascii_xs = [str(x_ascii + (col_idx * self.ascii_byte_w)) for col_idx in range(self.hex_cols)]
+        hex_byte = self._HEX_BYTE
+        ascii_escape = self._ASCII_ESCAPE
+        
         for row_item in rows_to_render:
             if row_item == 'SKIP':
                 # Render skip indicator
@@ -433,39 +473,31 @@ class CorkamistyleSVGExporter:
                 # Offset column
                 self.svg_parts.append(f'<text x="{x_offset}" y="{y}" class="hex-offset">{offset:04X}:</text>')
                 
-                # Hex bytes
+                # Hex bytes and ASCII, one joined block each per row
                 chunk = raw_data[offset:offset + self.hex_cols]
-                hex_parts = []
-                ascii_parts = []
-                
-                for col_idx, byte in enumerate(chunk):
-                    abs_idx = offset + col_idx
-                    
-                    # Find field color for this byte
-                    byte_color = self.COLORS['text_dim']
-                    for f_idx, field in enumerate(fields):
-                        if field.get('start') is not None:
-                            if field['start'] <= abs_idx < field['end']:
-                                byte_color = self._get_field_color(f_idx)
-                                break
-                    
-                    # Hex byte position - aligned with header
-                    bx = x_hex + (col_idx * self.hex_byte_w)
-                    if col_idx >= 8:
-                        bx += 15  # Gap between 7th and 8th byte
-                    
-                    hex_parts.append(f'<text x="{bx}" y="{y}" class="hex-byte" fill="{byte_color}">{byte:02X}</text>')
-                    
-                    # ASCII position
-                    ax = x_ascii + (col_idx * self.ascii_byte_w)
-                    char = chr(byte) if 32 <= byte < 127 else '·'
-                    char = self._escape(char)
-                    ascii_parts.append(f'<text x="{ax}" y="{y}" class="hex-ascii" fill="{byte_color}">{char}</text>')
-                    
-                    byte_row_map[abs_idx] = y
-                
-                self.svg_parts.extend(hex_parts)
-                self.svg_parts.extend(ascii_parts)
+                colors = row_colors[row_idx]
+                runs = self._color_runs(colors, len(chunk))
+                # One <text> per row: a color-class <tspan> per run, each byte
+                # placed on its column by its own x <tspan>
+                self.svg_parts.append(
+                    f'<text y="{y}" class="hex-byte">'
+                    + ''.join([
+                        f'<tspan class="{color}">'
+                        + ''.join([f'<tspan x="{hex_xs[col_idx]}">{hex_byte[chunk[col_idx]]}</tspan>'
+                                   for col_idx in range(lo, hi)])
+                        + '</tspan>'
+                        for color, lo, hi in runs
+                    ])
+                    + '</text>'
+                )
+                # Same-colored ASCII runs share one <text>; the x list keeps
+                # every character on its column
+                self.svg_parts.append('\n'.join([
+                    f'<text x="{" ".join(ascii_xs[lo:hi])}" y="{y}" class="hex-ascii {color}" xml:space="preserve">'
+                    f'{"".join([ascii_escape[byte] for byte in chunk[lo:hi]])}</text>'
+                    for color, lo, hi in runs
+                ]))
+                byte_row_map.update(dict.fromkeys(range(offset, offset + len(chunk)), y))
                 
                 y += self.hex_row_h
         
@@ -475,6 +507,7 @@ class CorkamistyleSVGExporter:
                            byte_row_map: Dict[int, int], x_start: int, y_start: int) -> int:
         """
         Render the field annotation table with raw/decoded comparison.
+        Expects fields already filtered by export.
         Returns end_y position.
         """
         # Column headers - aligned with hex dump header style
@@ -499,14 +532,17 @@ class CorkamistyleSVGExporter:
         y = header_y + 22
         connector_x = x_start - 10
         
+        # Leaf names repeat across array elements; escape each one once
+        escaped_names = {}
+        
         for f_idx, field in enumerate(fields):
-            field_color = self._get_field_color(f_idx)
-            name = field['name'].split('.')[-1]
-            depth = field['name'].count('.')
-            
-            # Skip internal fields
-            if name.startswith('_') or name in ('offset1', 'offset2', 'length'):
-                continue
+            ci = self._get_field_color_index(f_idx)
+            full_name = field['name']
+            name = full_name.rpartition('.')[2]
+            depth = full_name.count('.')
+            safe_name = escaped_names.get(name)
+            if safe_name is None:
+                safe_name = escaped_names[name] = self._escape(name)
             
             # Indent based on depth
             indent = depth * 15
@@ -514,9 +550,9 @@ class CorkamistyleSVGExporter:
             # Field name with color marker
             self.svg_parts.append(f'''
             <rect x="{col_name_x + indent - 8}" y="{y - 10}" width="4" height="12" 
-                  fill="{field_color}" rx="1"/>
-            <text x="{col_name_x + indent}" y="{y}" class="field-name" fill="{field_color}">
-                {self._escape(name)}
+                  class="c{ci}" rx="1"/>
+            <text x="{col_name_x + indent}" y="{y}" class="field-name c{ci}">
+                {safe_name}
             </text>
             ''')
             
@@ -562,22 +598,16 @@ class CorkamistyleSVGExporter:
             
             # Draw connector from hex dump to field
             if start is not None and byte_row_map and hasattr(self, 'hex_section_end_x'):
-                # Find the Y position for start byte
-                hex_y = None
-                for byte_idx in range(start, min(start + 16, end if end else start + 1)):
-                    if byte_idx in byte_row_map:
-                        if hex_y is None:
-                            hex_y = byte_row_map[byte_idx]
-                        break
+                # Find the Y position for start byte; the rows holding a field's
+                # first and last bytes are always rendered, so a direct lookup
+                # replaces scanning the field's byte range
+                hex_y = byte_row_map.get(start) if (end if end else start + 1) > start else None
                 
                 if hex_y is not None:
-                    # Find end Y position
+                    # Find end Y position (last byte actually present in the data)
                     end_y_pos = hex_y
                     if end is not None:
-                        for byte_idx in range(end - 1, start - 1, -1):
-                            if byte_idx in byte_row_map:
-                                end_y_pos = byte_row_map[byte_idx]
-                                break
+                        end_y_pos = byte_row_map.get(min(end, len(raw_data)) - 1, hex_y)
                     
                     mid_hex_y = (hex_y + end_y_pos) / 2
                     
@@ -586,7 +616,7 @@ class CorkamistyleSVGExporter:
                     self.svg_parts.append(f'''
                     <path d="M {bracket_x} {hex_y - 5} L {bracket_x + 5} {hex_y - 5} 
                              L {bracket_x + 5} {end_y_pos - 5} L {bracket_x} {end_y_pos - 5}" 
-                          stroke="{field_color}" fill="none" class="bracket"/>
+                          fill="none" class="bracket s{ci}"/>
                     ''')
                     
                     # Bezier curve connector to field table
@@ -594,8 +624,8 @@ class CorkamistyleSVGExporter:
                     cx2 = connector_x - 35
                     path = f"M {bracket_x + 5} {mid_hex_y - 5} C {cx1} {mid_hex_y - 5}, {cx2} {y - 5}, {connector_x} {y - 5}"
                     self.svg_parts.append(f'''
-                    <path d="{path}" stroke="{field_color}" class="connector"/>
-                    <circle cx="{connector_x}" cy="{y - 5}" r="3" fill="{field_color}"/>
+                    <path d="{path}" class="connector s{ci}"/>
+                    <circle cx="{connector_x}" cy="{y - 5}" r="3" class="c{ci}"/>
                     ''')
             
             y += self.field_row_h
@@ -637,19 +667,36 @@ class CorkamistyleSVGExporter:
         Returns:
             SVG string
         """
+        self._build(flattened_data, raw_data, title)
+        return '\n'.join(self.svg_parts)
+    
+    def export_iter(self, flattened_data: List[Dict], raw_data: bytes, 
+                    title: str = "BINARY_STRUCTURE") -> Iterator[str]:
+        """
+        Generate the same SVG as export() as a stream of string chunks.
+        
+        Writing the chunks to a file (e.g. with writelines) avoids holding
+        the fragments and the joined document in memory at the same time.
+        """
+        self._build(flattened_data, raw_data, title)
+        for i, part in enumerate(self.svg_parts):
+            if i:
+                yield '\n'
+            yield part
+    
+    def _build(self, flattened_data: List[Dict], raw_data: bytes, title: str):
+        """Render all SVG fragments into self.svg_parts"""
         self.svg_parts = []
         self.hex_section_end_x = 0  # Will be set by _render_hex_dump
         
-        # Filter out internal fields
-        excluded = {'offset1', 'offset2', 'length', '_io', 'subcon'}
+        # Filter out internal fields; the hex dump and field table both index
+        # colors by position in this list
         fields = [f for f in flattened_data 
-                  if not any(ex in f['name'] for ex in excluded) 
-                  and not f['name'].split('.')[-1].startswith('_')]
+                  if _EXCLUDED_SEGMENTS.isdisjoint(f['name'].split('.')) 
+                  and not f['name'].rpartition('.')[2].startswith('_')]
         
         # Calculate dimensions
-        sparse_rows = self._get_sparse_rows(raw_data, fields)
-        hex_rows = sum(1 for r in sparse_rows if r != 'SKIP')
-        skip_rows = sum(1 for r in sparse_rows if r == 'SKIP')
+        rows_to_render, hex_rows, skip_rows = self._get_sparse_rows(raw_data, fields)
         
         # Account for header rows in hex section (section header + column headers + divider)
         hex_header_height = 50  # Section header + column headers + spacing
@@ -680,7 +727,7 @@ class CorkamistyleSVGExporter:
         self._add_header(title, len(raw_data), len(fields))
         
         # Hex dump (left side) - this sets self.hex_section_end_x
-        hex_end_y, byte_map = self._render_hex_dump(raw_data, fields, self.margin_y)
+        hex_end_y, byte_map = self._render_hex_dump(raw_data, fields, rows_to_render, self.margin_y)
         
         # Calculate table position: after hex section with connector space
         # Add space for bracket connectors (about 80px)
@@ -695,11 +742,12 @@ class CorkamistyleSVGExporter:
         
         # Close SVG
         self.svg_parts.append('</svg>')
-        
-        return '\n'.join(self.svg_parts)
     
-    def _get_sparse_rows(self, raw_data: bytes, fields: List[Dict]) -> List:
-        """Calculate which rows to render (sparse view)"""
+    def _get_sparse_rows(self, raw_data: bytes, fields: List[Dict]) -> Tuple[List, int, int]:
+        """
+        Calculate which rows to render (sparse view for large files).
+        Returns (rows_to_render, hex_rows, skip_rows)
+        """
         interesting_rows = set([0, (len(raw_data) - 1) // self.hex_cols])
         
         for field in fields:
@@ -708,21 +756,26 @@ class CorkamistyleSVGExporter:
                 end_row = (field['end'] - 1) // self.hex_cols
                 interesting_rows.add(start_row)
                 interesting_rows.add(end_row)
+                # Add a row before and after for context
+                if start_row > 0:
+                    interesting_rows.add(start_row - 1)
+                interesting_rows.add(end_row + 1)
         
-        sorted_rows = sorted(list(interesting_rows))
-        result = []
-        
-        if sorted_rows:
-            prev = sorted_rows[0]
-            result.append(prev)
-            for r in sorted_rows[1:]:
-                if r > prev + 1:
-                    result.append('SKIP')
-                if r != prev:
-                    result.append(r)
-                prev = r
-        
-        return result
+        rows_to_render = []
+        hex_rows = skip_rows = 0
+        prev = None
+        
+        for r in sorted(interesting_rows):
+            if prev is not None and r > prev + 1:
+                rows_to_render.append('SKIP')
+                skip_rows += 1
+            rows_to_render.append(r)
+            # Rows past the end of the data are skipped when rendering
+            if r * self.hex_cols < len(raw_data):
+                hex_rows += 1
+            prev = r
+        
+        return rows_to_render, hex_rows, skip_rows
 
 
 # Backward-compatible function interface
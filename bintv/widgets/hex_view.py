@@ -1,33 +1,53 @@
 import string
 import asyncio
+import numpy as np
 from textual import work
-from textual.app import *
+from textual.binding import Binding
 from textual.strip import Strip
-from textual.containers import *
-from textual.geometry import Size
+from textual.geometry import Region, Size
 from textual.message import Message
 from textual.reactive import reactive
 from textual.scroll_view import ScrollView
-from textual.color import Color
-from rich.text import Text
 from rich.style import Style
-from rich.jupyter import JupyterMixin
-from rich.segment import Segment, Segments
+from rich.segment import Segment
+
+_GREEN = Style(color='green')
+_CURSOR = _GREEN + Style(bgcolor='white')
+
+
+# Byte -> itself when printable, '.' otherwise (decoded as latin-1)
+_PRINTABLE = bytes(b if chr(b).isprintable() else ord('.') for b in range(256))
+
+
+def _mouse_column(x):
+    """Byte index within a row for screen column x (0xFF when outside)"""
+    # Simple approach: assume hex region starts at column 1 and ASCII at column 50
+    if 1 <= x <= 50:  # Hex region, each byte takes ~3 chars
+        return min((x - 1) // 3, 15)
+    if 50 <= x <= 68:  # ASCII region
+        return min(x - 50, 15)
+    return 0xFF
+
+
+# Column -> byte lookup, so mouse moves do no per-event arithmetic
+_MOUSE_COLUMNS = bytes(_mouse_column(x) for x in range(69))
 
 
 class HexView(ScrollView, can_focus=True):
-    nibble_cursor = reactive(0)
-    cursor_visible = reactive(True)
+    nibble_cursor = reactive(0, repaint=False)
+    cursor_visible = reactive(True, repaint=False)
     data = reactive(bytearray(b''))
     blinking = reactive(True)
     edit_mode = reactive(False)
-    buffer = {}
     data_addr = reactive(0)
     virtual_size = Size(60,1)
     highlighted_field = reactive(None)
     elements = reactive(None)
     mouse_hover_offset = reactive(None)
     show_tooltip = reactive(False)
+
+    STRIP_CACHE_SIZE = 1024
+    TOOLTIP_DELAY = 0.05
     
     BINDINGS = [
         Binding("up", "cursor_up", "Cursor Up", show=False),
@@ -50,6 +70,90 @@ class HexView(ScrollView, can_focus=True):
             self.id = id
             super().__init__(*args, **kwargs)
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Pending edits, byte offset -> new byte value (int, not 1-byte bytes)
+        self.buffer = {}
+        # y -> (key, Strip); only rows whose bytes or cursor changed are regenerated
+        self._strip_cache = {}
+        self._data_mv = memoryview(b'')
+        self._line_count = 0
+        self._blank_strip = None
+        self._pending_mouse = None
+        self._mouse_timer = None
+        self._index_elements(None)
+
+    def watch_data(self, data):
+        self._strip_cache.clear()
+        # Edits patch the bytearray in place without resizing it, so the
+        # view and the line count stay valid until data is reassigned
+        self._data_mv = memoryview(data)
+        self._line_count = (len(data) + 15) // 16
+
+    def watch_elements(self, elements):
+        self._strip_cache.clear()
+        self._index_elements(elements)
+
+    def _index_elements(self, elements):
+        """
+        Split elements into parallel per-field arrays; fields are resolved
+        per rendered row rather than through a per-byte map of the file
+        """
+        self._field_starts = np.zeros(0, dtype=np.int64)
+        self._field_ends = np.zeros(0, dtype=np.int64)
+        self._field_names = []
+        self._field_types = []
+        self._byte_styles = [_GREEN]
+        if not elements:
+            return
+
+        chunks, colors = elements
+        # Fields without an integer offset get an empty [0, 0) range
+        mapped = ["start" in chunk and isinstance(chunk["start"], int) for chunk in chunks]
+        self._field_starts = np.array([chunk["start"] if ok else 0 for chunk, ok in zip(chunks, mapped)], dtype=np.int64)
+        self._field_ends = np.array([chunk["end"] if ok else 0 for chunk, ok in zip(chunks, mapped)], dtype=np.int64)
+        self._field_names = [chunk.get("name", f"Field {idx}") for idx, chunk in enumerate(chunks)]
+        self._field_types = [chunk.get("type", "unknown") for chunk in chunks]
+        # Indexed by field + 1 so unmapped bytes resolve to plain green;
+        # green over each distinct background is composed once per table
+        field_styles = {}
+        for color in colors:
+            if color not in field_styles:
+                field_styles[color] = _GREEN + Style(bgcolor=color)
+        self._byte_styles = [_GREEN] + [field_styles[color] for color in colors]
+
+    def _row_styles(self, offset, length):
+        """
+        Composed style per byte of a row, or None when neither a field nor
+        the visible cursor touches it. The last field covering a byte wins,
+        and the visible cursor wins over fields.
+        """
+        end = offset + length
+        hits = np.flatnonzero((self._field_starts < end) & (self._field_ends > offset))
+        cursor = self.get_byte_cursor()
+        has_cursor = self.cursor_visible and offset <= cursor < end
+        decorated = has_cursor
+        styles = [_GREEN] * length
+        # Ascending field order, so later fields overwrite earlier ones
+        for idx in hits.tolist():
+            lo = max(int(self._field_starts[idx]), offset) - offset
+            hi = min(int(self._field_ends[idx]), end) - offset
+            if lo < hi:
+                styles[lo:hi] = [self._byte_styles[idx + 1]] * (hi - lo)
+                decorated = True
+        if not decorated:
+            return None
+        if has_cursor:
+            styles[cursor - offset] = _CURSOR
+        return styles
+
+    def watch_cursor_visible(self):
+        # Blinking only changes the cursor's own row
+        self._refresh_row(self.get_byte_cursor() // 16)
+
+    def _refresh_row(self, row):
+        self.refresh(Region(0, row - self.scroll_offset.y, self.size.width, 1))
+
     def get_byte_cursor(self):
         return self.nibble_cursor >> 1
 
@@ -58,24 +162,22 @@ class HexView(ScrollView, can_focus=True):
         if not self.elements or offset >= len(self.data):
             return None
             
-        chunks, colors = self.elements
-        for idx, chunk in enumerate(chunks):
-            if "start" in chunk and isinstance(chunk["start"], int):
-                if chunk["start"] <= offset < chunk["end"]:
-                    field_name = chunk.get("name", f"Field {idx}")
-                    field_type = chunk.get("type", "unknown")
-                    size = chunk["end"] - chunk["start"]
-                    rel_offset = offset - chunk["start"]
-                    return {
-                        "name": field_name,
-                        "type": field_type,
-                        "size": size,
-                        "start": chunk["start"],
-                        "end": chunk["end"],
-                        "relative_offset": rel_offset,
-                        "absolute_offset": offset
-                    }
-        return None
+        hits = np.flatnonzero((self._field_starts <= offset) & (offset < self._field_ends))
+        if not hits.size:
+            return None
+
+        idx = int(hits[0])
+        start = int(self._field_starts[idx])
+        end = int(self._field_ends[idx])
+        return {
+            "name": self._field_names[idx],
+            "type": self._field_types[idx],
+            "size": end - start,
+            "start": start,
+            "end": end,
+            "relative_offset": offset - start,
+            "absolute_offset": offset
+        }
 
     def get_mouse_offset(self, x, y):
         """Get the byte offset for mouse coordinates"""
@@ -83,25 +185,12 @@ class HexView(ScrollView, can_focus=True):
         actual_y = y + scroll_y
         
         # Calculate which row was clicked
-        if actual_y >= (len(self.data) // 16) + 1:
+        if actual_y >= self._line_count:
             return None
             
-        row_offset = actual_y * 16
-        
-        # Simple approach: assume hex region starts at column 3 and ASCII at column 52
-        if 1 <= x <= 50:  # Hex region (approximate)
-            # Click in hex region - rough calculation
-            relative_x = x - 1
-            byte_index = min(relative_x // 3, 15)  # Each byte takes ~3 chars
-            cursor_pos = row_offset + byte_index
-            
-        elif 50 <= x <= 68:  # ASCII region (approximate)
-            # Click in ASCII region
-            relative_x = x - 50
-            byte_index = min(relative_x, 15)
-            cursor_pos = row_offset + byte_index
-        else:
+        if not 0 <= x < len(_MOUSE_COLUMNS) or _MOUSE_COLUMNS[x] == 0xFF:
             return None
+        cursor_pos = actual_y * 16 + _MOUSE_COLUMNS[x]
             
         # Ensure cursor position is within data bounds
         if cursor_pos < len(self.data):
@@ -109,16 +198,28 @@ class HexView(ScrollView, can_focus=True):
         return None
 
     def on_mouse_move(self, event):
-        """Handle mouse movement for tooltip"""
-        offset = self.get_mouse_offset(event.x, event.y)
+        """Handle mouse movement for tooltip, debounced to the last position"""
+        self._pending_mouse = (event.x, event.y)
+        self._cancel_mouse_timer()
+        self._mouse_timer = self.set_timer(self.TOOLTIP_DELAY, self._update_hover)
+
+    def _update_hover(self):
+        self._mouse_timer = None
+        offset = self.get_mouse_offset(*self._pending_mouse)
         if offset is not None:
             self.mouse_hover_offset = offset
             self.show_tooltip = True
         else:
             self.show_tooltip = False
 
+    def _cancel_mouse_timer(self):
+        if self._mouse_timer is not None:
+            self._mouse_timer.stop()
+            self._mouse_timer = None
+
     def on_leave(self, event):
         """Hide tooltip when mouse leaves the widget"""
+        self._cancel_mouse_timer()
         self.show_tooltip = False
 
     def on_click(self, event):
@@ -129,76 +230,54 @@ class HexView(ScrollView, can_focus=True):
             self.cursor_visible = True
             self.post_message(self.CursorUpdate(self.id, offset))
 
-    def generate_ascii_segments(self, offset, line_data):
-        cursor = self.get_byte_cursor()
+    def generate_ascii_segments(self, line_data, styles):
+        text = bytes(line_data).translate(_PRINTABLE).decode('latin-1')
         segments = [Segment(" ")]
-        for i,b in enumerate(line_data):
-            txt = "."
-            styles = [Style(color='green')]
-
-            if self.elements:
-                chunks,colors = self.elements
-                for idx, chunk in enumerate(chunks):
-                    if "start" in chunk and isinstance(chunk["start"], int):
-                        if chunk["start"] <= i+offset < chunk["end"]:
-                            styles.append(Style(bgcolor=colors[idx]))
-
-            if self.cursor_visible and cursor == offset+i:
-                styles.append(Style(bgcolor='white'))
-
-            if chr(b).isprintable():
-                txt = f"{chr(b)}"
-
-            segments.append(Segment(txt, Style.chain(*styles)))
+        for txt, style in zip(text, styles):
+            segments.append(Segment(txt, style))
 
         if len(line_data) % 0x10 != 0:
             segments.append(Segment(" "*(0x10 - (len(line_data) % 0x10))))
 
         return segments
 
-    def generate_hex_segments(self, offset, line_data):
-        cursor = self.get_byte_cursor()
+    def generate_hex_segments(self, line_data, styles):
         segments = []
-        sum_of_chunks_szs = 0
-        for col_start in range(0, 16, 8):
-            chunk = self.data[offset+col_start:offset+col_start+8]
-            sum_of_chunks_szs += len(chunk)
-            if not chunk:
-                break
-            for i,b in enumerate(chunk):
-                space = Segment("  ")
-                txt = '00'
-                styles = [Style(color='green')]
-                if b != 0:
-                    txt = f"{b:02x}"
-   
-                if self.elements:
-                    chunks,colors = self.elements
-                    for idx, chunk in enumerate(chunks):
-                        if "start" in chunk and isinstance(chunk["start"], int):
-                            if chunk["start"] <= i+offset+col_start < chunk["end"]:
-                                styles.append(Style(bgcolor=colors[idx]))
-                                if i+offset+col_start+1 != chunk["end"] and (i+offset+col_start+1) % 0x10 != 0:
-                                    space = Segment("  ", Style(bgcolor=colors[idx]))
-
-
-                if self.cursor_visible and cursor == offset+i+col_start:
-                    styles.append(Style(bgcolor='white'))
-
-                segments.append(Segment(" ", Style(color='green')))
-                segments.append(Segment(txt, Style.chain(*styles)))
-        segments.append(Segment(" ", Style(color='green')))
-        if sum_of_chunks_szs % 0x10 != 0x0:
-            segments.append(Segment("   "*(0x10-(sum_of_chunks_szs%0x10))))
+        for b, style in zip(line_data, styles):
+            segments.append(Segment(" ", _GREEN))
+            segments.append(Segment(f"{b:02x}", style))
+        segments.append(Segment(" ", _GREEN))
+        if len(line_data) % 0x10 != 0x0:
+            segments.append(Segment("   "*(0x10-(len(line_data)%0x10))))
+
+        return segments
 
+    def _generate_line_fast(self, line_data):
+        """Already-coalesced segments for a line with nothing to decorate"""
+        pad = 0x10 - len(line_data)
+        segments = [
+            Segment(" "),
+            Segment(f" {line_data.hex(' ')} ", _GREEN),
+            Segment("   "*pad + " "),
+            Segment(bytes(line_data).translate(_PRINTABLE).decode('latin-1'), _GREEN),
+        ]
+        if pad:
+            segments.append(Segment(" "*pad))
         return segments
 
     def generate_line(self, offset, line_data):
+        styles = self._row_styles(offset, len(line_data))
+        # Most lines carry no field or cursor; skip per-byte styling for them
+        if line_data and styles is None:
+            return self._generate_line_fast(line_data)
+
+        styles = styles or []
         segments = []
         segments.append(Segment(' '))
-        segments.extend(self.generate_hex_segments(offset, line_data))
-        segments.extend(self.generate_ascii_segments(offset, line_data))
-        return segments
+        segments.extend(self.generate_hex_segments(line_data, styles))
+        segments.extend(self.generate_ascii_segments(line_data, styles))
+        # Runs of same-style bytes collapse into single segments
+        return list(Segment.simplify(segments))
 
     @work
     async def blinker(self):
@@ -217,9 +296,26 @@ class HexView(ScrollView, can_focus=True):
     def render_line(self, y):
         scroll_x, scroll_y = self.scroll_offset
         y += scroll_y
-        if y < (len(self.data) // 16)+1:
-            return Strip(self.generate_line(y*16, self.data[y*16:(y+1)*16]))
-        return Strip.blank(20, self.rich_style)
+        if y < self._line_count:
+            offset = y*16
+            line_data = self._data_mv[offset:offset+16].tobytes()
+            cursor = self.get_byte_cursor()
+            cursor_col = cursor - offset if self.cursor_visible and offset <= cursor < offset+16 else None
+            key = (line_data, cursor_col)
+            cached = self._strip_cache.get(y)
+            if cached is not None and cached[0] == key:
+                return cached[1]
+            strip = Strip(self.generate_line(offset, line_data))
+            if len(self._strip_cache) >= self.STRIP_CACHE_SIZE:
+                self._strip_cache.clear()
+            self._strip_cache[y] = (key, strip)
+            return strip
+
+        # Rows past the data share one blank strip until the style changes
+        rich_style = self.rich_style
+        if self._blank_strip is None or self._blank_strip[0] != rich_style:
+            self._blank_strip = (rich_style, Strip.blank(20, rich_style))
+        return self._blank_strip[1]
 
     async def watch_mouse_hover_offset(self, old_offset, new_offset):
         """Update tooltip when hover offset changes"""
@@ -268,41 +364,39 @@ class HexView(ScrollView, can_focus=True):
                     event.prevent_default()
                     event.stop()
 
-    async def watch_nibble_cursor(self):
+    def watch_nibble_cursor(self, old_nibble_cursor, nibble_cursor):
+        # Only the rows the cursor left and entered change; scrolling
+        # below repaints the whole view by itself
+        self._refresh_row((old_nibble_cursor >> 1) >> 4)
+        self._refresh_row((nibble_cursor >> 1) >> 4)
+
         scroll_y = self.scroll_offset.y
-        cursor_y = (self.nibble_cursor >> 1) // 16 
+        cursor_y = (nibble_cursor >> 1) >> 4
+        if scroll_y <= cursor_y < scroll_y + self.size.height:
+            return
         if cursor_y < scroll_y:
             self.scroll_to(y=cursor_y, animate=False)
         elif cursor_y >= scroll_y + self.size.height:
             self.scroll_to(y=cursor_y - self.size.height + 1, animate=False)
 
-    def action_cursor_right(self):
-        next_nibble_cursor = self.nibble_cursor + (1<<1)
-        next_nibble_cursor = next_nibble_cursor & ~1
-        if (next_nibble_cursor>>1) < len(self.data):
+    def _move_cursor(self, delta_bytes):
+        # nibble_cursor is kept even, so stepping by whole bytes needs no masking
+        next_nibble_cursor = self.nibble_cursor + (delta_bytes << 1)
+        if 0 <= (next_nibble_cursor >> 1) < len(self.data):
             self.nibble_cursor = next_nibble_cursor
         self.post_message(self.CursorUpdate(self.id, self.nibble_cursor >> 1))
 
+    def action_cursor_right(self):
+        self._move_cursor(1)
+
     def action_cursor_left(self):
-        next_nibble_cursor = self.nibble_cursor - (1<<1)
-        next_nibble_cursor = next_nibble_cursor & ~1
-        if (next_nibble_cursor>>1) >= 0:
-            self.nibble_cursor = next_nibble_cursor
-        self.post_message(self.CursorUpdate(self.id, self.nibble_cursor >> 1))
+        self._move_cursor(-1)
 
     def action_cursor_up(self):
-        next_nibble_cursor = self.nibble_cursor - (16<<1)
-        next_nibble_cursor = next_nibble_cursor & ~1
-        if (next_nibble_cursor>>1) >= 0:
-            self.nibble_cursor = next_nibble_cursor
-        self.post_message(self.CursorUpdate(self.id, self.nibble_cursor >> 1))
+        self._move_cursor(-16)
 
     def action_cursor_down(self):
-        next_nibble_cursor = self.nibble_cursor + (16<<1)
-        next_nibble_cursor = next_nibble_cursor & ~1
-        if (next_nibble_cursor>>1) < len(self.data):
-            self.nibble_cursor = next_nibble_cursor
-        self.post_message(self.CursorUpdate(self.id, self.nibble_cursor >> 1))
+        self._move_cursor(16)
 
     def action_goto_end(self):
         """Move cursor to the last byte of data"""
@@ -11,10 +11,53 @@ from textual.message import Message
 from textual.reactive import reactive
 from textual.binding import Binding
 
-from typing import List, Optional, Callable
+from typing import Dict, List, Optional, Callable
 from bintv.pcap_parser import ParsedPacket, format_ip, format_mac
 
 
+# Protocol column colors
+PROTOCOL_STYLES = {
+    'TCP': 'green',
+    'UDP': 'blue',
+    'ICMP': 'yellow',
+    'ARP': 'magenta',
+    'DNS': 'cyan',
+    'HTTP': 'bold green',
+    'IPv4': 'white',
+    'IPv6': 'white',
+}
+
+# Ready-made protocol cell markup; unknown protocols are added on first use
+_PROTOCOL_MARKUP = {proto: f"[{style}]{proto}[/{style}]" for proto, style in PROTOCOL_STYLES.items()}
+
+
+# Names shown next to numeric fields in the packet details pane
+_PORT_NAMES = {
+    20: 'FTP-DATA', 21: 'FTP', 22: 'SSH', 23: 'TELNET',
+    25: 'SMTP', 53: 'DNS', 67: 'DHCP', 68: 'DHCP',
+    80: 'HTTP', 110: 'POP3', 143: 'IMAP', 443: 'HTTPS',
+    993: 'IMAPS', 995: 'POP3S', 3306: 'MySQL', 5432: 'PostgreSQL',
+    6379: 'Redis', 8080: 'HTTP-ALT', 8443: 'HTTPS-ALT',
+}
+
+_IP_PROTOCOL_NAMES = {
+    1: 'ICMP', 6: 'TCP', 17: 'UDP', 58: 'ICMPv6',
+    47: 'GRE', 50: 'ESP', 51: 'AH', 89: 'OSPF',
+}
+
+_ETHERTYPE_NAMES = {
+    0x0800: 'IPv4', 0x0806: 'ARP', 0x86DD: 'IPv6',
+    0x8100: 'VLAN', 0x88CC: 'LLDP',
+}
+
+
+def _protocol_markup(protocol: str) -> str:
+    markup = _PROTOCOL_MARKUP.get(protocol)
+    if markup is None:
+        markup = _PROTOCOL_MARKUP.setdefault(protocol, f"[white]{protocol}[/white]")
+    return markup
+
+
 class PacketList(Widget):
     """
     A widget that displays network packets in a table format.
@@ -83,9 +126,14 @@ class PacketList(Widget):
         super().__init__(*args, **kwargs)
         self._packets = packets or []
         self._filtered_indices: List[int] = []
+        self._index_to_row: Dict[int, int] = {}
         self._table: Optional[DataTable] = None
         self._filter_func: Optional[Callable[[ParsedPacket], bool]] = None
         self._first_timestamp: float = 0
+        # Formatted cells per column, built on first populate after set_packets
+        self._columns: Optional[tuple] = None
+        # Set when the table is stale because a change arrived while hidden
+        self._dirty = False
     
     def compose(self) -> ComposeResult:
         yield DataTable(id="packet-table", cursor_type="row")
@@ -105,68 +153,97 @@ class PacketList(Widget):
         self._table.add_column("Length", width=8, key="len")
         self._table.add_column("Info", width=50, key="info")
     
+    def _build_columns(self):
+        """Format the display cells of every packet into per-column lists"""
+        packets = self._packets
+        if packets:
+            self._first_timestamp = packets[0].timestamp
+        first_ts = self._first_timestamp
+        fmt_time = "{:.6f}".format
+        
+        numbers, times, lengths = [], [], []
+        sources, destinations, protocols, infos = [], [], [], []
+        for packet in packets:
+            # src_addr, dst_addr and info are computed properties; read each once
+            src = packet.src_addr
+            dst = packet.dst_addr
+            info = packet.info
+            numbers.append(str(packet.index + 1))
+            times.append(fmt_time(packet.timestamp - first_ts))
+            sources.append(src[:17] if src else "")
+            destinations.append(dst[:17] if dst else "")
+            protocols.append(_protocol_markup(packet.protocol))
+            lengths.append(str(len(packet.raw_data)))
+            infos.append(info[:48] if info else "")
+        
+        self._columns = (numbers, times, sources, destinations, protocols, lengths, infos)
+    
     def _populate_table(self):
         """Populate the table with packets"""
-        self._table.clear()
-        self._filtered_indices.clear()
+        self._dirty = False
         
-        if self._packets:
-            self._first_timestamp = self._packets[0].timestamp
+        # Cells only depend on the packets, so filter changes reuse them
+        columns_current = self._columns is not None
+        if not columns_current:
+            self._build_columns()
+        numbers, times, sources, destinations, protocols, lengths, infos = self._columns
         
-        for i, packet in enumerate(self._packets):
-            if self._filter_func and not self._filter_func(packet):
-                continue
-            
-            self._filtered_indices.append(i)
-            
-            # Calculate relative time
-            rel_time = packet.timestamp - self._first_timestamp
-            
-            # Get protocol color
-            proto = packet.protocol
-            proto_style = self._get_protocol_style(proto)
-            
-            self._table.add_row(
-                str(packet.index + 1),
-                f"{rel_time:.6f}",
-                packet.src_addr[:17] if packet.src_addr else "",
-                packet.dst_addr[:17] if packet.dst_addr else "",
-                f"[{proto_style}]{proto}[/{proto_style}]",
-                str(len(packet.raw_data)),
-                packet.info[:48] if packet.info else "",
-                key=str(i),
-            )
+        filter_func = self._filter_func
+        if filter_func:
+            indices = [i for i, packet in enumerate(self._packets) if filter_func(packet)]
+        else:
+            indices = list(range(len(self._packets)))
+        
+        # A filter change that matches the same packets leaves the table as is
+        if (columns_current and indices == self._filtered_indices
+                and self._table.row_count == len(indices)):
+            return
+        
+        self._filtered_indices[:] = indices
+        self._index_to_row.clear()
+        self._index_to_row.update((index, row) for row, index in enumerate(self._filtered_indices))
+        
+        # DataTable.add_rows cannot take row keys, which selection relies on,
+        # so keys (the packet index as a string) are passed per row inside a
+        # single batched update instead
+        with self.app.batch_update():
+            self._table.clear()
+            add_row = self._table.add_row
+            for i in self._filtered_indices:
+                add_row(
+                    numbers[i], times[i], sources[i], destinations[i],
+                    protocols[i], lengths[i], infos[i],
+                    key=str(i),
+                )
     
     def _get_protocol_style(self, protocol: str) -> str:
         """Get style for protocol"""
-        styles = {
-            'TCP': 'green',
-            'UDP': 'blue',
-            'ICMP': 'yellow',
-            'ARP': 'magenta',
-            'DNS': 'cyan',
-            'HTTP': 'bold green',
-            'IPv4': 'white',
-            'IPv6': 'white',
-        }
-        return styles.get(protocol, 'white')
+        return PROTOCOL_STYLES.get(protocol, 'white')
     
     def set_packets(self, packets: List[ParsedPacket]):
         """Set the packets to display"""
         self._packets = packets
-        if self._table:
-            self._populate_table()
+        self._columns = None
+        self._schedule_repopulate()
     
     def set_filter(self, filter_func: Optional[Callable[[ParsedPacket], bool]]):
         """Set a filter function for packets"""
         self._filter_func = filter_func
-        if self._table:
-            self._populate_table()
+        self._schedule_repopulate()
     
     def clear_filter(self):
         """Clear the current filter"""
         self._filter_func = None
-        if self._table:
+        self._schedule_repopulate()
+    
+    def _schedule_repopulate(self):
+        """Repopulate now if displayed, otherwise when next shown"""
+        self._dirty = True
+        if self._table and self.display:
+            self._populate_table()
+    
+    def on_show(self):
+        if self._dirty and self._table:
             self._populate_table()
     
     def get_selected_packet(self) -> Optional[ParsedPacket]:
@@ -180,8 +257,8 @@ class PacketList(Widget):
     
     def goto_packet(self, index: int):
         """Navigate to a specific packet by index"""
-        if index in self._filtered_indices:
-            row_idx = self._filtered_indices.index(index)
+        row_idx = self._index_to_row.get(index)
+        if row_idx is not None:
             self._table.move_cursor(row=row_idx)
     
     def on_data_table_row_selected(self, event: DataTable.RowSelected):
@@ -217,6 +294,11 @@ class PacketList(Widget):
         self.post_message(self.SearchRequested())
 
 
+# Markup templates for the packet details pane
+_LAYER_HEADER_FMT = "[bold cyan]▼ {}[/bold cyan]".format
+_FIELD_LINE_FMT = "    [green]{}[/green]: {}".format
+
+
 class PacketDetails(Widget):
     """
     Widget to display detailed packet information in a tree structure.
@@ -262,23 +344,24 @@ class PacketDetails(Widget):
         if not self._packet:
             self._content = "[dim]No packet selected[/dim]"
         else:
+            packet = self._packet
             lines = []
+            append = lines.append
+            format_value = self._format_field_value
             
             # Frame info
-            lines.append(f"[bold]Frame {self._packet.index + 1}[/bold]: {len(self._packet.raw_data)} bytes")
-            lines.append("")
+            append(f"[bold]Frame {packet.index + 1}[/bold]: {len(packet.raw_data)} bytes")
+            append("")
             
             # Each layer
-            for layer_name, layer_data in self._packet.layers.items():
-                layer_title = layer_name.upper()
-                lines.append(f"[bold cyan]▼ {layer_title}[/bold cyan]")
+            for layer_name, layer_data in packet.layers.items():
+                append(_LAYER_HEADER_FMT(layer_name.upper()))
                 
                 if isinstance(layer_data, dict):
                     for field_name, field_value in layer_data.items():
-                        formatted_value = self._format_field_value(field_name, field_value)
-                        lines.append(f"    [green]{field_name}[/green]: {formatted_value}")
+                        append(_FIELD_LINE_FMT(field_name, format_value(field_name, field_value)))
                 
-                lines.append("")
+                append("")
             
             self._content = "\n".join(lines)
         
@@ -297,12 +380,9 @@ class PacketDetails(Widget):
                 return format_ip(value)
             elif 'ip' in name.lower() and len(value) == 16:
                 # IPv6
-                parts = []
-                for i in range(0, 16, 2):
-                    parts.append(f"{value[i]:02x}{value[i+1]:02x}")
-                return ":".join(parts)
+                return value.hex(":", 2)
             elif len(value) <= 16:
-                return " ".join(f"{b:02x}" for b in value)
+                return value.hex(" ")
             else:
                 return f"[{len(value)} bytes]"
         
@@ -321,27 +401,12 @@ class PacketDetails(Widget):
     
     def _get_port_name(self, port: int) -> str:
         """Get well-known port name"""
-        ports = {
-            20: 'FTP-DATA', 21: 'FTP', 22: 'SSH', 23: 'TELNET',
-            25: 'SMTP', 53: 'DNS', 67: 'DHCP', 68: 'DHCP',
-            80: 'HTTP', 110: 'POP3', 143: 'IMAP', 443: 'HTTPS',
-            993: 'IMAPS', 995: 'POP3S', 3306: 'MySQL', 5432: 'PostgreSQL',
-            6379: 'Redis', 8080: 'HTTP-ALT', 8443: 'HTTPS-ALT',
-        }
-        return ports.get(port, '')
+        return _PORT_NAMES.get(port, '')
     
     def _get_protocol_name(self, proto: int) -> str:
         """Get IP protocol name"""
-        protocols = {
-            1: 'ICMP', 6: 'TCP', 17: 'UDP', 58: 'ICMPv6',
-            47: 'GRE', 50: 'ESP', 51: 'AH', 89: 'OSPF',
-        }
-        return protocols.get(proto, '')
+        return _IP_PROTOCOL_NAMES.get(proto, '')
     
     def _get_ethertype_name(self, etype: int) -> str:
         """Get EtherType name"""
-        types = {
-            0x0800: 'IPv4', 0x0806: 'ARP', 0x86DD: 'IPv6',
-            0x8100: 'VLAN', 0x88CC: 'LLDP',
-        }
-        return types.get(etype, '')
+        return _ETHERTYPE_NAMES.get(etype, '')
@@ -5,13 +5,204 @@ from textual.widgets.tree import TreeNode
 from textual.message import Message
 from textual.events import Click, Key
 from textual.screen import ModalScreen
+from textual.timer import Timer
 from textual.containers import Grid, Horizontal, Vertical
+from rich.style import Style
 from rich.text import Text
 from typing import Dict, Any, Optional
 from datetime import datetime
+from functools import lru_cache
 from construct import Container, ListContainer
 import struct
-import base64
+
+# --- Value type styling for tree labels ---
+# Parsed once so labels share Style objects instead of re-resolving names
+_KEY_STYLE = Style.parse("bold cyan")
+_INDEX_STYLE = Style.parse("magenta")
+_TYPE_STYLE = Style.parse("dim")
+_VALUE_STYLES = {
+    name: Style.parse(name)
+    for name in ("red", "yellow", "magenta", "blue", "green", "cyan", "bold cyan", "bold magenta", "dim")
+}
+
+def _null_style(value):
+    return "null", _VALUE_STYLES["red"], "null"
+
+def _bool_style(value):
+    return "bool", _VALUE_STYLES["yellow"], str(value).lower()
+
+def _int_style(value):
+    # Signed width in bits: -128..255 fit in 8, -32768..65535 in 16, etc.
+    bits = value.bit_length() if value >= 0 else (~value).bit_length() + 1
+    if bits <= 8:
+        value_type, style, fmt = "byte", _VALUE_STYLES["magenta"], "%d (0x%02X)"
+    elif bits <= 16:
+        value_type, style, fmt = "word", _VALUE_STYLES["magenta"], "%d (0x%04X)"
+    elif bits <= 32:
+        value_type, style, fmt = "dword", _VALUE_STYLES["magenta"], "%d (0x%08X)"
+    else:
+        value_type, style, fmt = "int", _VALUE_STYLES["blue"], "%d (0x%X)"
+    return value_type, style, fmt % (value, value)
+
+def _float_style(value):
+    return "float", _VALUE_STYLES["blue"], f"{value}"
+
+def _bytes_style(value):
+    if len(value) <= 16:
+        return "bytes", _VALUE_STYLES["green"], value.hex(" ")
+    else:
+        return "bytes", _VALUE_STYLES["green"], f"{value[:8].hex(' ')}... ({len(value)} bytes)"
+
+def _str_style(value):
+    if len(value) > 32:
+        return "str", _VALUE_STYLES["green"], f'"{value[:29]}..."'
+    return "str", _VALUE_STYLES["green"], f'"{value}"'
+
+def _datetime_style(value):
+    return "datetime", _VALUE_STYLES["cyan"], value.isoformat()
+
+def _struct_style(value):
+    return "struct", _VALUE_STYLES["bold cyan"], "{...}"
+
+def _array_style(value):
+    return "array", _VALUE_STYLES["bold magenta"], f"[{len(value)} items]"
+
+def _other_style(value):
+    return type(value).__name__, _VALUE_STYLES["dim"], str(value)
+
+def _raw_offsets(value):
+    """Return (offset1, offset2) of a RawCopy result, or None."""
+    if hasattr(value, "offset1") and hasattr(value, "offset2"):
+        return (value.offset1, value.offset2)
+    return None
+
+# Containers that become tree branches (when non-empty); construct's
+# Container and ListContainer subclass dict and list.
+_STRUCT_TYPES = dict
+_ARRAY_TYPES = list
+
+def _same_subtree(a, b):
+    """
+    True when two parsed values would show identical subtrees. Stricter than
+    ==, which treats 1, 1.0 and True alike and 0.0 as equal to -0.0.
+    """
+    stack = [(a, b)]
+    while stack:
+        a, b = stack.pop()
+        if type(a) is not type(b):
+            return False
+        if isinstance(a, _STRUCT_TYPES):
+            keys = [key for key in a if key[:1] != "_"]
+            if keys != [key for key in b if key[:1] != "_"]:
+                return False
+            stack.extend((a[key], b[key]) for key in keys)
+        elif isinstance(a, _ARRAY_TYPES):
+            if len(a) != len(b):
+                return False
+            stack.extend(zip(a, b))
+        elif isinstance(a, float):
+            # repr keeps the sign of zero and matches nan with nan
+            if repr(a) != repr(b):
+                return False
+        elif a != b:
+            return False
+    return True
+
+# Exact-type branch kind ("struct"/"array", "" for leaf types); anything
+# not listed (subclasses, enums, ...) goes through _branch_kind.
+_BRANCH_KINDS = {
+    Container: "struct",
+    dict: "struct",
+    ListContainer: "array",
+    list: "array",
+    type(None): "",
+    bool: "",
+    int: "",
+    float: "",
+    bytes: "",
+    str: "",
+    datetime: "",
+}
+
+def _branch_kind(value):
+    if isinstance(value, _STRUCT_TYPES):
+        return "struct"
+    if isinstance(value, _ARRAY_TYPES):
+        return "array"
+    return ""
+
+# Exact-type dispatch for the common case; one dict lookup per node.
+_VALUE_STYLE_HANDLERS = {
+    type(None): _null_style,
+    bool: _bool_style,
+    int: _int_style,
+    float: _float_style,
+    bytes: _bytes_style,
+    str: _str_style,
+    datetime: _datetime_style,
+    Container: _struct_style,
+    dict: _struct_style,
+    ListContainer: _array_style,
+    list: _array_style,
+}
+
+# Repeated small ints, flags, magic bytes and short strings are common
+# across fields. typed=True keeps 1 and True apart; floats and datetimes
+# are left out because equal values (0.0 / -0.0, the same instant in two
+# timezones) can display differently. Longer bytes and strings skip the
+# cache: hashing them costs a full pass and the cache would keep them alive.
+_CACHED_STYLE_TYPES = frozenset((bool, int, str, bytes))
+_CACHED_STYLE_MAX_LEN = 16
+
+@lru_cache(maxsize=4096, typed=True)
+def _cached_value_style(value):
+    return _VALUE_STYLE_HANDLERS[type(value)](value)
+
+# Ordered isinstance checks for subclasses; bool must precede int.
+_VALUE_STYLE_FALLBACKS = (
+    (bool, _bool_style),
+    (int, _int_style),
+    (float, _float_style),
+    (bytes, _bytes_style),
+    (str, _str_style),
+    (datetime, _datetime_style),
+    (dict, _struct_style),
+    (list, _array_style),
+)
+
+
+# --- Value parsing for the editor ---
+_HEX_SEPARATORS = str.maketrans("", "", " :")
+
+# Larger byte values are only shown in part; hex-encoding a multi-megabyte
+# RawCopy payload into an Input stalls the UI for no useful display.
+_EDIT_BYTES_LIMIT = 1024
+_TRUNCATED_MARKER = "...(truncated)"
+
+def _parse_int(text):
+    text = text.replace("_", "")
+    base = 16 if text.lower().startswith("0x") else 10
+    return int(text, base)
+
+def _parse_bytes(text):
+    if text.endswith(_TRUNCATED_MARKER):
+        raise ValueError("Value was truncated for editing; enter the full bytes")
+    return bytes.fromhex(text.translate(_HEX_SEPARATORS).replace("0x", ""))
+
+def _parse_bool(text):
+    return text.lower() in ("true", "1", "yes", "on")
+
+# Editor value type -> parser; other types are kept as the entered string
+_VALUE_PARSERS = {
+    "byte": _parse_int,
+    "word": _parse_int,
+    "dword": _parse_int,
+    "int": _parse_int,
+    "bytes": _parse_bytes,
+    "bool": _parse_bool,
+    "float": float,
+}
+
 
 # --- 1. The Dynamic Tooltip Editor ---
 class EditValueScreen(ModalScreen):
@@ -51,8 +242,12 @@ class EditValueScreen(ModalScreen):
     }
     """
 
-    def __init__(self, x: int, y: int, field_name: str, current_value: any, value_type: str):
+    def __init__(self, x: int = 0, y: int = 0, field_name: str = "", current_value: any = None, value_type: str = ""):
         super().__init__()
+        self.prepare(x, y, field_name, current_value, value_type)
+
+    def prepare(self, x: int, y: int, field_name: str, current_value: any, value_type: str):
+        """Set the field to edit; the screen is reused between edits."""
         self.target_x = x
         self.target_y = y
         self.field_name = field_name
@@ -71,19 +266,31 @@ class EditValueScreen(ModalScreen):
                 classes="compact"
             )
 
-    def on_mount(self):
+    def on_screen_resume(self):
+        # Runs on every push, so a reused screen shows the current field
+        self.query_one(".info-label", Label).update(f"Edit {self.field_name} ({self.value_type})")
+        input_widget = self.query_one("#value-input", Input)
+        input_widget.value = self._get_initial_text()
+        input_widget.cursor_position = 0
+        # Select once laid out, as focusing a fresh Input would; this also
+        # scrolls the view to the end of the new text
+        self.call_after_refresh(input_widget.select_all)
+        input_widget.styles.background = None  # Clear earlier error feedback
+
         # Position the popover near the cursor/node
         container = self.query_one("#popover-container")
         container.styles.offset = (self.target_x, self.target_y)
         
         # Auto-focus the input so user can type immediately
-        self.query_one("#value-input").focus()
+        input_widget.focus()
 
     def _get_initial_text(self):
         val = self.current_value
         if val is None:
             return ""
         if isinstance(val, bytes):
+            if len(val) > _EDIT_BYTES_LIMIT:
+                return val[:_EDIT_BYTES_LIMIT].hex(" ") + _TRUNCATED_MARKER
             return val.hex(" ")
         if isinstance(val, int):
             return f"0x{val:X}"
@@ -105,6 +312,10 @@ class EditValueScreen(ModalScreen):
     def _attempt_save(self):
         input_widget = self.query_one("#value-input", Input)
         raw_text = input_widget.value.strip()
+        if raw_text.endswith(_TRUNCATED_MARKER) and raw_text == self._get_initial_text():
+            # Untouched truncated preview: nothing to write back
+            self.dismiss(None)
+            return
 
         try:
             new_value = self._parse_value(raw_text)
@@ -116,18 +327,8 @@ class EditValueScreen(ModalScreen):
     def _parse_value(self, text: str):
         if not text: return None
         
-        if self.value_type in ["byte", "word", "dword", "int"]:
-            text = text.replace("_", "")
-            base = 16 if text.lower().startswith("0x") else 10
-            return int(text, base)
-        elif self.value_type == "bytes":
-            clean = text.replace(" ", "").replace(":", "").replace("0x", "")
-            return bytes.fromhex(clean)
-        elif self.value_type == "bool":
-            return text.lower() in ("true", "1", "yes", "on")
-        elif self.value_type == "float":
-            return float(text)
-        return text
+        parser = _VALUE_PARSERS.get(self.value_type)
+        return parser(text) if parser else text
 
 
 # --- 2. The Context Menu Screen ---
@@ -166,8 +367,12 @@ class ContextMenu(ModalScreen):
 
     BINDINGS = [("escape", "dismiss", "Close")]
 
-    def __init__(self, x: int, y: int, field_data: dict):
+    def __init__(self, x: int = 0, y: int = 0, field_data: dict = None):
         super().__init__()
+        self.prepare(x, y, field_data)
+
+    def prepare(self, x: int, y: int, field_data: dict):
+        """Set position and target field; the menu is reused between clicks."""
         self.menu_x = x
         self.menu_y = y
         self.field_data = field_data
@@ -178,9 +383,11 @@ class ContextMenu(ModalScreen):
             yield Button("📋 Copy Value", id="copy-value")
             yield Button("🚀 Go to Offset", id="goto-offset")
 
-    def on_mount(self):
+    def on_screen_resume(self):
         container = self.query_one("#menu-container")
         container.styles.offset = (self.menu_x, self.menu_y)
+        # Start from the first entry, not the one picked last time
+        self.query_one(Button).focus()
 
     def on_button_pressed(self, event: Button.Pressed) -> None:
         self.dismiss((event.button.id, self.field_data))
@@ -199,15 +406,30 @@ class ReactiveConstructTree(Tree):
         ("right", "show_context_menu", "Context Menu"),  
     ]
 
-    parsed_data = reactive(None)
-    _expanded_paths = set()
+    # always_update: Textual would otherwise compare old and new parses with
+    # Container.__eq__, a deep Python-level walk, on every assignment
+    parsed_data = reactive(None, always_update=True)
+    UPDATE_DELAY = 1 / 60
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Pending coalesced update_tree call, if any
+        self._update_timer: Optional[Timer] = None
+        # The parsed_data object the tree was last scheduled to show
+        self._shown_data = None
+        # Maps a field path (as stored in node data) to its tree node.
+        self._path_index: Dict[str, TreeNode] = {"": self.root}
 
     class GotoOffsetRequest(Message):
+        __slots__ = ("offset",)
+
         def __init__(self, offset: int):
             self.offset = offset
             super().__init__()
 
     class FieldEditRequest(Message):
+        __slots__ = ("field_path", "field_name", "value", "value_type", "offset", "length")
+
         def __init__(self, field_path: str, field_name: str, value: Any, value_type: str, offset: int, length: int):
             self.field_path = field_path
             self.field_name = field_name
@@ -217,6 +439,13 @@ class ReactiveConstructTree(Tree):
             self.length = length
             super().__init__()
 
+    def process_label(self, label) -> Text:
+        # Tree keeps only the first line of a label, via Text.split(), which
+        # copies it; the labels built here are single-line fresh Text objects.
+        if isinstance(label, Text) and "\n" not in label.plain:
+            return label
+        return super().process_label(label)
+
     def _log(self, message: str, level: str = "info"):
         if hasattr(self.app, "log_message"):
             self.app.log_message(message, level=level)
@@ -255,8 +484,9 @@ class ReactiveConstructTree(Tree):
             "trigger_y": y
         }
         
-        menu = ContextMenu(x, y, field_data)
-        self.app.push_screen(menu, self.handle_menu_result)
+        name, menu = self._reusable_screen(ContextMenu)
+        menu.prepare(x, y, field_data)
+        self.app.push_screen(name, self.handle_menu_result)
 
     def handle_menu_result(self, result: tuple) -> None:
         if not result: return
@@ -278,10 +508,9 @@ class ReactiveConstructTree(Tree):
                     copy_text = str(value)
                 
                 try:
-                    encoded = base64.b64encode(copy_text.encode()).decode()
-                    osc52 = f"\033]52;c;{encoded}\007"
-                    self.app.console.file.write(osc52)
-                    self.app.console.file.flush()
+                    # Emits OSC 52 through the driver, whose writer thread
+                    # does the terminal write off the event loop
+                    self.app.copy_to_clipboard(copy_text)
                     self._log(f"📋 Copied: {copy_text[:30]}...")
                 except Exception:
                     pass
@@ -313,7 +542,8 @@ class ReactiveConstructTree(Tree):
         value_type, _, _ = self.get_value_type_style(current_value)
 
         # Launch the new Tooltip Editor
-        edit_screen = EditValueScreen(target_x, target_y, field_key, current_value, value_type)
+        name, edit_screen = self._reusable_screen(EditValueScreen)
+        edit_screen.prepare(target_x, target_y, field_key, current_value, value_type)
         
         def finish_edit(new_value):
             if new_value is not None:
@@ -329,156 +559,244 @@ class ReactiveConstructTree(Tree):
                     )
                 )
 
-        self.app.push_screen(edit_screen, finish_edit)
+        self.app.push_screen(name, finish_edit)
+
+    def _reusable_screen(self, screen_class) -> tuple:
+        """Return (name, screen) of this tree's installed screen_class instance.
+
+        Installed screens survive being dismissed, so the menu and editor
+        are composed once rather than on every right-click.
+        """
+        name = self._screen_name(screen_class)
+        if not self.app.is_screen_installed(name):
+            self.app.install_screen(screen_class(), name)
+        return name, self.app.get_screen(name)
+
+    def _screen_name(self, screen_class) -> str:
+        return f"{screen_class.__name__}-{id(self)}"
+
+    def on_unmount(self) -> None:
+        for screen_class in (ContextMenu, EditValueScreen):
+            name = self._screen_name(screen_class)
+            # A screen still on the stack (quit while a menu or dialog is
+            # open) can't be uninstalled; App teardown discards it instead
+            if (self.app.is_screen_installed(name)
+                    and self.app.get_screen(name) not in self.app.screen_stack):
+                self.app.uninstall_screen(name)
 
     def _get_field_offsets(self, field_path: str) -> tuple:
         """Robust offset finder (checks parent containers)."""
         if not self.parsed_data: return (None, None)
         
-        parts = field_path.split("/")[1:]
+        # Populated nodes carry their offsets, worked out in _child_entries
+        node = self._path_index.get(field_path)
+        if node is not None and node.data:
+            return node.data["offsets"]
+        
         current = self.parsed_data
         parent = None
+        for part in field_path.split("/")[1:]:
+            parent = current
+            if isinstance(current, dict):
+                if part not in current:
+                    return (None, None)
+                current = current[part]
+            elif isinstance(current, list):
+                index = part.strip("[]")
+                if not index.lstrip("-").isdecimal():
+                    return (None, None)
+                idx = int(index)
+                if not -len(current) <= idx < len(current):
+                    return (None, None)
+                current = current[idx]
         
-        try:
-            for part in parts:
-                parent = current
-                if isinstance(current, (dict, Container)):
-                    current = current[part]
-                elif isinstance(current, (list, ListContainer)):
-                    idx = int(part.strip("[]"))
-                    current = current[idx]
-            
-            # Check self
-            if hasattr(current, "offset1") and hasattr(current, "offset2"):
-                return (current.offset1, current.offset2)
-            # Check parent
-            if parent and hasattr(parent, "offset1") and hasattr(parent, "offset2"):
-                return (parent.offset1, parent.offset2)
-                
-        except (KeyError, IndexError, ValueError, AttributeError):
-            pass
-        
-        return (None, None)
+        # Check self, then the parent
+        offsets = _raw_offsets(current)
+        if offsets is None and parent:
+            offsets = _raw_offsets(parent)
+        return offsets or (None, None)
     
     def update_tree(self) -> None:
-        self._save_expanded_paths()
-        self.root.remove_children()
-        if self.parsed_data is not None:
-            self.populate_node(self.root, self.parsed_data)
+        _cached_value_style.cache_clear()
+        # Walk the populated part of the tree alongside the new data; matching
+        # nodes are relabelled in place and only a node whose children changed
+        # shape (keys, count, branch vs leaf) has them rebuilt.
+        stack = [(self.root, self.parsed_data, "")]
+        while stack:
+            node, data, path = stack.pop()
+            entries = list(self._child_entries(data, path))
+            children = node.children
+            if len(children) != len(entries) or any(
+                child.data["path"] != entry[0] or child.allow_expand != entry[3]
+                for child, entry in zip(children, entries)
+            ):
+                self._rebuild_children(node, data, path)
+                continue
+            for child, (child_path, label, child_data, is_branch) in zip(children, entries):
+                if child.label != label:
+                    child.set_label(label)
+                if is_branch and "_pending" not in child.data:
+                    # An identical subtree (offsets included, for RawCopy) can
+                    # keep its nodes; comparing is far cheaper than rebuilding
+                    # labels. The branch's own offsets may be inherited from a
+                    # moved parent RawCopy, so its data is refreshed regardless.
+                    if _same_subtree(child.data["value"], child_data["value"]):
+                        child.data["value"] = child_data["value"]
+                        child.data["offsets"] = child_data["offsets"]
+                        continue
+                    del child_data["_pending"]
+                    stack.append((child, child_data["value"], child_path))
+                child.data = child_data
         self.root.expand()
-        self._restore_expanded_paths()
     
-    def _save_expanded_paths(self) -> None:
-        self._expanded_paths = set()
-        def _collect(node, current_path):
+    def _rebuild_children(self, node: TreeNode, data, path: str) -> None:
+        """Replace the children of node, keeping expanded state below it."""
+        expanded = self._collect_expanded(node)
+        prefix = f"{path}/"
+        for stale in [p for p in self._path_index if p.startswith(prefix)]:
+            del self._path_index[stale]
+        node.remove_children()
+        self.populate_node(node, data, path)
+        self._restore_expanded(expanded)
+    
+    def _collect_expanded(self, start: TreeNode) -> list:
+        """Return the field paths of the expanded nodes below start."""
+        expanded = []
+        stack = list(start.children)
+        while stack:
+            node = stack.pop()
             if node.is_expanded:
-                self._expanded_paths.add(current_path)
-            for child in node.children:
-                _collect(child, f"{current_path}/{child.label.plain}")
-        _collect(self.root, self.root.label.plain)
+                expanded.append(node.data["path"])
+            stack.extend(node.children)
+        return expanded
     
-    def _restore_expanded_paths(self) -> None:
-        def _expand(node, current_path):
-            if current_path in self._expanded_paths:
+    def _restore_expanded(self, paths: list) -> None:
+        # find_node_by_path populates collapsed ancestors on the way down
+        for path in paths:
+            node = self.find_node_by_path(path)
+            if node is not None and node.allow_expand:
+                self._populate_pending(node)
                 node.expand()
-            for child in node.children:
-                _expand(child, f"{current_path}/{child.label.plain}")
-        _expand(self.root, self.root.label.plain)
     
     def watch_parsed_data(self, new_data) -> None:
-        self.update_tree()
+        # Re-assigning the same object needs no refresh
+        if new_data is self._shown_data:
+            return
+        self._shown_data = new_data
+        self._schedule_update()
+    
+    def _schedule_update(self) -> None:
+        # Several assignments within one frame result in a single update
+        if self._update_timer is None:
+            self._update_timer = self.set_timer(self.UPDATE_DELAY, self._do_update)
+    
+    def _do_update(self) -> None:
+        self._update_timer = None
+        # One repaint for the whole sync rather than one per relabel/rebuild
+        with self.app.batch_update():
+            self.update_tree()
+    
+    def on_tree_node_expanded(self, event: Tree.NodeExpanded) -> None:
+        self._populate_pending(event.node)
+    
+    def _populate_pending(self, node: TreeNode) -> None:
+        """Add the children of a branch that has not been populated yet."""
+        data = node.data
+        if data and data.pop("_pending", False):
+            self.populate_node(node, data["value"], data["path"])
     
     def get_value_type_style(self, value):
-        if value is None:
-            return "null", "red", "null"
-        elif isinstance(value, bool):
-            return "bool", "yellow", str(value).lower()
-        elif isinstance(value, int):
-            if -128 <= value <= 255:
-                hex_val = f"0x{value:02X}"
-                return "byte", "magenta", f"{value} ({hex_val})"
-            elif -32768 <= value <= 65535:
-                hex_val = f"0x{value:04X}"
-                return "word", "magenta", f"{value} ({hex_val})"
-            elif -2147483648 <= value <= 4294967295:
-                hex_val = f"0x{value:08X}"
-                return "dword", "magenta", f"{value} ({hex_val})"
+        value_class = type(value)
+        if value_class in _CACHED_STYLE_TYPES:
+            if value_class not in (bytes, str) or len(value) <= _CACHED_STYLE_MAX_LEN:
+                return _cached_value_style(value)
+            return _VALUE_STYLE_HANDLERS[value_class](value)
+        handler = _VALUE_STYLE_HANDLERS.get(value_class)
+        if handler is None:
+            # Subclasses (IntEnum, EnumIntegerString, ...) fall back to isinstance
+            for types, candidate in _VALUE_STYLE_FALLBACKS:
+                if isinstance(value, types):
+                    handler = candidate
+                    break
             else:
-                hex_val = f"0x{value:X}"
-                return "int", "blue", f"{value} ({hex_val})"
-        elif isinstance(value, float):
-            return "float", "blue", f"{value}"
-        elif isinstance(value, bytes):
-            if len(value) <= 16:
-                hex_str = value.hex()
-                hex_formatted = ' '.join(hex_str[i:i+2] for i in range(0, len(hex_str), 2))
-                return "bytes", "green", f"{hex_formatted}"
-            else:
-                hex_preview = value[:8].hex()
-                hex_formatted = ' '.join(hex_preview[i:i+2] for i in range(0, len(hex_preview), 2))
-                return "bytes", "green", f"{hex_formatted}... ({len(value)} bytes)"
-        elif isinstance(value, str):
-            if len(value) > 32:
-                return "str", "green", f'"{value[:29]}..."'
-            return "str", "green", f'"{value}"'
-        elif isinstance(value, datetime):
-            return "datetime", "cyan", value.isoformat()
-        elif isinstance(value, (Container, dict)):
-            return "struct", "bold cyan", "{...}"
-        elif isinstance(value, (ListContainer, list)):
-            return "array", "bold magenta", f"[{len(value)} items]"
-        else:
-            return type(value).__name__, "dim", str(value)
+                handler = _other_style
+        return handler(value)
     
-    def populate_node(self, node: TreeNode, data, path: str = "") -> None:
-        if isinstance(data, (Container, dict)):
+    def _child_entries(self, data, path: str):
+        """Yield (path, label, node data, is_branch) for each child of data."""
+        value_type_style = self.get_value_type_style
+        branch_kinds = _BRANCH_KINDS.get
+        # RawCopy offsets of each child, falling back to the enclosing RawCopy
+        parent_offsets = _raw_offsets(data) or (None, None)
+        if isinstance(data, _STRUCT_TYPES):
+            prefix = path + "/"
             for key, value in data.items():
-                if key.startswith("_"):
+                if key[:1] == "_":
                     continue
                 
-                current_path = f"{path}/{key}"
-                key_text = Text(str(key), style="bold cyan")
+                current_path = prefix + key
+                offsets = _raw_offsets(value) or parent_offsets
                 
-                if isinstance(value, (Container, dict, ListContainer, list)) and value:
-                    value_type, value_style, display_value = self.get_value_type_style(value)
-                    key_text.append(f" ({value_type})", style="dim")
-                    child = node.add(key_text, data={"path": current_path, "key": key, "value": value})
-                    self.populate_node(child, value, current_path)
+                # Branches only show their kind; skip formatting a display value
+                branch_kind = branch_kinds(type(value))
+                if branch_kind is None:
+                    branch_kind = _branch_kind(value)
+                if branch_kind and value:
+                    key_text = Text.assemble(str(key), (f" ({branch_kind})", _TYPE_STYLE), style=_KEY_STYLE)
+                    yield current_path, key_text, {"path": current_path, "key": key, "value": value, "offsets": offsets, "_pending": True}, True
                 else:
-                    value_type, value_style, display_value = self.get_value_type_style(value)
-                    key_text.append(f" ({value_type}): ", style="dim")
-                    key_text.append(display_value, style=value_style)
-                    node.add_leaf(key_text, data={"path": current_path, "key": key, "value": value})
+                    value_type, value_style, display_value = value_type_style(value)
+                    key_text = Text.assemble(
+                        str(key),
+                        (f" ({value_type}): ", _TYPE_STYLE),
+                        (display_value, value_style),
+                        style=_KEY_STYLE,
+                    )
+                    yield current_path, key_text, {"path": current_path, "key": key, "value": value, "offsets": offsets}, False
                         
-        elif isinstance(data, (ListContainer, list)):
+        elif isinstance(data, _ARRAY_TYPES):
+            prefix = path + "/"
             for i, item in enumerate(data):
-                current_path = f"{path}/{i}"
-                index_text = Text(f"[{i}]", style="magenta")
+                current_path = prefix + str(i)
+                offsets = _raw_offsets(item) or parent_offsets
                 
-                if isinstance(item, (Container, dict, ListContainer, list)) and item:
-                    value_type, value_style, display_value = self.get_value_type_style(item)
-                    index_text.append(f" ({value_type})", style="dim")
-                    child = node.add(index_text, data={"path": current_path, "index": i, "value": item})
-                    self.populate_node(child, item, current_path)
+                # Branches only show their kind; skip formatting a display value
+                branch_kind = branch_kinds(type(item))
+                if branch_kind is None:
+                    branch_kind = _branch_kind(item)
+                if branch_kind and item:
+                    index_text = Text.assemble(f"[{i}]", (f" ({branch_kind})", _TYPE_STYLE), style=_INDEX_STYLE)
+                    yield current_path, index_text, {"path": current_path, "index": i, "value": item, "offsets": offsets, "_pending": True}, True
                 else:
-                    value_type, value_style, display_value = self.get_value_type_style(item)
-                    index_text.append(f" ({value_type}): ", style="dim")
-                    index_text.append(display_value, style=value_style)
-                    node.add_leaf(index_text, data={"path": current_path, "index": i, "value": item})
+                    value_type, value_style, display_value = value_type_style(item)
+                    index_text = Text.assemble(
+                        f"[{i}]",
+                        (f" ({value_type}): ", _TYPE_STYLE),
+                        (display_value, value_style),
+                        style=_INDEX_STYLE,
+                    )
+                    yield current_path, index_text, {"path": current_path, "index": i, "value": item, "offsets": offsets}, False
+    
+    def populate_node(self, node: TreeNode, data, path: str = "") -> None:
+        """Add one level of children; branches are filled in when expanded."""
+        path_index = self._path_index
+        for current_path, label, node_data, is_branch in self._child_entries(data, path):
+            if is_branch:
+                child = node.add(label, data=node_data)
+            else:
+                child = node.add_leaf(label, data=node_data)
+            path_index[current_path] = child
 
     def find_node_by_path(self, path):
-        parts = path.split("/")
-        current = self.root
-        for part in parts[1:]:
-            for child in current.children:
-                node_data = child.data
-                if node_data:
-                    if "key" in node_data and str(node_data["key"]) == part:
-                        current = child
-                        break
-                    elif "index" in node_data and str(node_data["index"]) == part:
-                        current = child
-                        break
-            else:
+        node = self._path_index.get(path)
+        if node is not None:
+            return node
+        # Populate collapsed ancestors on the way down
+        prefix = ""
+        for part in path.split("/")[1:]:
+            parent = self._path_index.get(prefix)
+            if parent is None:
                 return None
-        return current
+            self._populate_pending(parent)
+            prefix = f"{prefix}/{part}"
+        return self._path_index.get(path)
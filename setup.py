@@ -1,6 +1,3 @@
-import os
-import sys
-import subprocess
 from pathlib import Path
 from setuptools import setup, find_packages
 